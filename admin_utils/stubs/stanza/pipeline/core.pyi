@@ -2,7 +2,8 @@ from core_utils.pipeline import StanzaDocument, UDPipeResultProtocol
 
 class Pipeline:
 
-    def __init__(self, lang: str, processors: str, logging_level: str, download_method: None = None) -> None:
+    def __init__(self, lang: str, processors: str, logging_level: str, download_method: None = None,
+                 use_gpu: bool = False, tokenize_no_ssplit: bool = False, **kwargs: int) -> None:
         """
         Initializes instance.
         """
@@ -12,6 +13,11 @@ class Pipeline:
         Explicit processing.
         """
 
+    def bulk_process(self, docs: list[str]) -> list[StanzaDocument]:
+        """
+        Batched processing of raw texts.
+        """
+
     # This is very strange to have one library to be leaked to another.
     # This item has to be addressed in the future.
     def __call__(self, text: str) -> UDPipeResultProtocol:
@@ -0,0 +1,31 @@
+from core_utils.pipeline import StanzaDocument, UDPipeResultProtocol
+
+class Model:
+
+    @staticmethod
+    def load(path: str) -> 'Model':
+        """
+        Loads a model from file.
+        """
+
+class Pipeline:
+
+    DEFAULT: str
+
+    def __init__(self, model: Model, input_format: str, tagger: str, parser: str,
+                 output_format: str) -> None:
+        """
+        Initializes instance.
+        """
+
+    # Protocol types leak here the same way as in the stanza stub;
+    # see the note in stanza/pipeline/core.pyi.
+    def process(self, text: StanzaDocument) -> list[StanzaDocument]:
+        """
+        Run the loaded pipeline on raw text.
+        """
+
+    def __call__(self, text: str) -> UDPipeResultProtocol:
+        """
+        Call instance as a function to process.
+        """
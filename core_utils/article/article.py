@@ -70,6 +70,10 @@ class Article:
     """
     Article class implementation.
     """
+
+    __slots__ = ('url', 'article_id', 'title', 'date', 'author', 'topics', 'text',
+                 'pos_frequencies', '_conllu_sentences', 'pattern_matches', '_conllu_info')
+
     #: A date
     date: datetime.datetime | None
 
@@ -57,14 +57,15 @@ def to_cleaned(article: Article) -> None:
         file.write(article.get_cleaned_text())
 
 
-def to_meta(article: Article) -> None:
+def to_meta(article: Article, path: Optional[Union[pathlib.Path, str]] = None) -> None:
     """
     Save metafile.
 
     Args:
         article (Article): Article instance
+        path (Optional[Union[pathlib.Path, str]]): Pre-resolved path to meta info
     """
-    with open(article.get_meta_file_path(), 'w', encoding='utf-8') as meta_file:
+    with open(path or article.get_meta_file_path(), 'w', encoding='utf-8') as meta_file:
         json.dump(article.get_meta(),
                   meta_file,
                   indent=4,
@@ -2,17 +2,27 @@
 Crawler implementation.
 """
 # pylint: disable=too-many-arguments, too-many-instance-attributes, unused-import, undefined-variable
+# pylint: disable=too-few-public-methods
 import datetime
 import json
 import pathlib
 import re
 import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from random import randrange
-from time import sleep
-from typing import Pattern, Union
+from time import monotonic, sleep
+from typing import Iterator, Pattern, Union
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import html
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 from core_utils import constants
 from core_utils.article.article import Article
@@ -62,6 +72,53 @@ class IncorrectVerifyError(Exception):
     """
 
 
+NUM_FETCH_WORKERS = 8
+
+# the global rate limiter admits ~2 requests per second, so keeping more seed
+# pages in flight only wastes requests once the article quota is reached
+NUM_SEED_PREFETCH = 2
+
+SEED_URL_PREFIX = 'https://baikal24.ru/'
+
+TEASER_LINK_STRAINER = SoupStrainer(class_='news-teaser__link')
+
+def _xpath_has_class(class_name: str) -> str:
+    """
+    Build an XPath predicate matching a CSS class as a whole token.
+
+    Args:
+        class_name (str): CSS class to match
+
+    Returns:
+        str: XPath predicate that ignores substring-only matches like article__tags
+    """
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+ARTICLE_META_CLASSES = ('article__title', 'article__author', 'article__date', 'article__tag')
+
+ARTICLE_META_XPATH = '//*[' + ' or '.join(map(_xpath_has_class, ARTICLE_META_CLASSES)) + ']'
+ARTICLE_TEXT_XPATH = ('//div[@class="article__content clearfix"]'
+                      '//p[' + _xpath_has_class('article__text') + ']')
+
+
+def _is_valid_seed_url(url: str) -> bool:
+    """
+    Check that a seed url points to the target site.
+
+    Args:
+        url (str): Seed url candidate
+
+    Returns:
+        bool: Whether the url is a valid seed url
+    """
+    if not isinstance(url, str) or not url.startswith(SEED_URL_PREFIX):
+        return False
+
+    tail = url[len(SEED_URL_PREFIX):]
+    return not tail or (tail.startswith('?page=') and tail[len('?page='):].isdigit())
+
+
 class Config:
     """
     Class for unpacking and validating configurations.
@@ -75,9 +132,9 @@ class Config:
             path_to_config (pathlib.Path): Path to configuration.
         """
         self.path_to_config = path_to_config
-        self._validate_config_content()
 
         self.config = self._extract_config_content()
+        self._validate_config_content(self.config)
 
         self._seed_urls = self.config.seed_urls
         self._num_articles = self.config.total_articles
@@ -87,6 +144,11 @@ class Config:
         self._should_verify_certificate = self.config.should_verify_certificate
         self._headless_mode = self.config.headless_mode
 
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=32)
+        self._session.mount('https://', adapter)
+
 
     def _extract_config_content(self) -> ConfigDTO:
         """
@@ -95,22 +157,26 @@ class Config:
         Returns:
             ConfigDTO: Config values
         """
+        if orjson is not None:
+            with open(file=self.path_to_config, mode='rb') as file:
+                return ConfigDTO(**orjson.loads(file.read()))
+
         with open(file=self.path_to_config, mode='r', encoding='utf-8') as file:
             config_content = json.load(file)
         return ConfigDTO(**config_content)
 
 
 
-    def _validate_config_content(self) -> None:
+    def _validate_config_content(self, config: ConfigDTO) -> None:
         """
         Ensure configuration parameters are not corrupt.
-        """
-        config = self._extract_config_content()
 
+        Args:
+            config (ConfigDTO): Config values to check
+        """
         if not(
                 isinstance(config.seed_urls, list)
-                and all(re.match(r'https://baikal24\.ru/(?:\?page=)?\d*', url)
-                        for url in config.seed_urls)
+                and all(_is_valid_seed_url(url) for url in config.seed_urls)
         ):
             raise IncorrectSeedURLError
 
@@ -197,6 +263,45 @@ class Config:
         """
         return self._headless_mode
 
+    def get_session(self) -> requests.Session:
+        """
+        Retrieve session with keep-alive connections to the target host.
+
+        Returns:
+            requests.Session: Session with configured headers and connection pool
+        """
+        return self._session
+
+
+class RateLimiter:
+    """
+    Enforce a minimal gap between consecutive requests to the target host.
+    """
+
+    def __init__(self, requests_per_second: float = 2.0) -> None:
+        """
+        Initialize an instance of the RateLimiter class.
+
+        Args:
+            requests_per_second (float): Allowed request rate
+        """
+        self._min_gap = 1.0 / requests_per_second
+        self._last_request = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Block until the next request is allowed to start.
+        """
+        with self._lock:
+            gap = self._min_gap - (monotonic() - self._last_request)
+            if gap > 0:
+                sleep(gap)
+            self._last_request = monotonic()
+
+
+RATE_LIMITER = RateLimiter()
+
 
 def make_request(url: str, config: Config) -> requests.models.Response:
     """
@@ -209,10 +314,21 @@ def make_request(url: str, config: Config) -> requests.models.Response:
     Returns:
         requests.models.Response: A response from a request
     """
-    headers = config.get_headers()
+    session = config.get_session()
     timeout = config.get_timeout()
 
-    return requests.get(url=url, headers=headers, timeout=timeout)
+    RATE_LIMITER.wait()
+    response = session.get(url=url, timeout=timeout)
+
+    if response.status_code in (429, 503):
+        retry_after = response.headers.get('Retry-After', '')
+        sleep(int(retry_after) if retry_after.isdigit() else 1)
+
+        RATE_LIMITER.wait()
+        response = session.get(url=url, timeout=timeout)
+
+    response.encoding = config.get_encoding()
+    return response
 
 
 class Crawler:
@@ -232,52 +348,62 @@ class Crawler:
 
         self.config = config
         self.urls = []
+        self._seen_urls: set[str] = set()
+        self._seed_urls = set(config.get_seed_urls())
         self.url_pattern = 'https://baikal24.ru'
 
-    def _extract_url(self, article_bs: BeautifulSoup) -> str:
+    def _extract_urls(self, article_bs: BeautifulSoup) -> Iterator[str]:
         """
-        Find and retrieve url from HTML.
+        Find and retrieve all article urls from HTML in one pass.
 
         Args:
             article_bs (bs4.BeautifulSoup): BeautifulSoup instance
 
-        Returns:
-            str: Url from HTML
+        Yields:
+            str: Full url from HTML
         """
-        links = article_bs.find_all(class_='news-teaser__link')
-        url = ''
-
-        for link in links:
+        for link in article_bs.find_all(class_='news-teaser__link'):
             url = self.url_pattern + link['href']
-            if url in self.get_search_urls():
-                continue
-            if url and url not in self.urls:
-                break
-
-        return url
+            if url and url not in self._seed_urls:
+                yield url
 
 
     def find_articles(self) -> None:
         """
         Find articles.
         """
-        seed_urls = self.get_search_urls()
+        seed_urls = list(dict.fromkeys(self.get_search_urls()))
+        num_articles = self.config.get_num_articles()
 
-        for seed_url in seed_urls:
-            response = make_request(seed_url, self.config)
-            if not response.ok:
-                continue
+        if len(self.urls) >= num_articles:
+            return
 
-            article_soup = BeautifulSoup(response.text, features='lxml')
-            new_url = self._extract_url(article_soup)
-            while new_url:
-                if len(self.urls) == self.config.get_num_articles():
-                    break
-                self.urls.append(new_url)
-                new_url = self._extract_url(article_soup)
+        with ThreadPoolExecutor(max_workers=NUM_SEED_PREFETCH) as executor:
+            pending = deque(executor.submit(make_request, url, self.config)
+                            for url in seed_urls[:NUM_SEED_PREFETCH])
+            next_seed = NUM_SEED_PREFETCH
 
-            if len(self.urls) == self.config.get_num_articles():
-                break
+            while pending:
+                response = pending.popleft().result()
+
+                if response.ok:
+                    article_soup = BeautifulSoup(response.content, features='lxml',
+                                                 parse_only=TEASER_LINK_STRAINER,
+                                                 from_encoding=self.config.get_encoding())
+                    for url in self._extract_urls(article_soup):
+                        if url in self._seen_urls:
+                            continue
+                        self._seen_urls.add(url)
+                        self.urls.append(url)
+                        if len(self.urls) == num_articles:
+                            for future in pending:
+                                future.cancel()
+                            return
+
+                if next_seed < len(seed_urls):
+                    pending.append(executor.submit(make_request, seed_urls[next_seed],
+                                                   self.config))
+                    next_seed += 1
 
 
     def get_search_urls(self) -> list:
@@ -314,45 +440,47 @@ class HTMLParser:
         self.config = config
         self.article = Article(full_url, article_id)
 
-    def _fill_article_with_text(self, article_soup: BeautifulSoup) -> None:
+    def _fill_article_with_text(self, article_tree: html.HtmlElement) -> None:
         """
         Find text of article.
 
         Args:
-            article_soup (bs4.BeautifulSoup): BeautifulSoup instance
+            article_tree (lxml.html.HtmlElement): Document tree
         """
-        main_div = article_soup.find('div', class_='article__content clearfix')
-        texts = []
-        if main_div:
-            all_ps = main_div.find_all('p', class_='article__text')
-            texts = [p.text for p in all_ps]
+        paragraphs = article_tree.xpath(ARTICLE_TEXT_XPATH)
 
-        self.article.text = ''.join(texts)
+        self.article.text = ''.join(p.text_content() for p in paragraphs)
 
-    def _fill_article_with_meta_information(self, article_soup: BeautifulSoup) -> None:
+    def _fill_article_with_meta_information(self, article_tree: html.HtmlElement) -> None:
         """
         Find meta information of article.
 
         Args:
-            article_soup (bs4.BeautifulSoup): BeautifulSoup instance
+            article_tree (lxml.html.HtmlElement): Document tree
         """
-        title = article_soup.find(class_='article__title')
-        if title:
-            self.article.title = title.text
+        title = author = date_node = None
+
+        for node in article_tree.xpath(ARTICLE_META_XPATH):
+            classes = node.get('class', '').split()
+            if title is None and 'article__title' in classes:
+                title = node
+            elif author is None and 'article__author' in classes:
+                author = node
+            elif date_node is None and 'article__date' in classes:
+                date_node = node
+            elif 'article__tag' in classes:
+                self.article.topics.append(node.text_content())
+
+        if title is not None:
+            self.article.title = title.text_content()
 
-        author = article_soup.find(class_='article__author')
-        if not author:
+        if author is None:
             self.article.author.append('NOT FOUND')
         else:
-            self.article.author.append(author.text.strip())
+            self.article.author.append(author.text_content().strip())
 
-        date_str = article_soup.find(class_='article__date')
-        if date_str:
-            self.article.date = self.unify_date_format(date_str.text)
-
-        tags = article_soup.find_all(class_='article__tag')
-        for tag in tags:
-            self.article.topics.append(tag.text)
+        if date_node is not None:
+            self.article.date = self.unify_date_format(date_node.text_content())
 
     def unify_date_format(self, date_str: str) -> datetime.datetime:
         """
@@ -377,9 +505,10 @@ class HTMLParser:
 
         response = make_request(self.full_url, self.config)
         if response.ok:
-            article_bs = BeautifulSoup(response.text, features='lxml')
-            self._fill_article_with_text(article_bs)
-            self._fill_article_with_meta_information(article_bs)
+            tree_parser = html.HTMLParser(encoding=self.config.get_encoding())
+            article_tree = html.fromstring(response.content, parser=tree_parser)
+            self._fill_article_with_text(article_tree)
+            self._fill_article_with_meta_information(article_tree)
 
         return self.article
 
@@ -391,9 +520,19 @@ def prepare_environment(base_path: Union[pathlib.Path, str]) -> None:
     Args:
         base_path (Union[pathlib.Path, str]): Path where articles stores
     """
-    if base_path.exists():
-        shutil.rmtree(base_path)
-    base_path.mkdir(parents=True, exist_ok=True)
+    shutil.rmtree(base_path, ignore_errors=True)
+    pathlib.Path(base_path).mkdir(parents=True, exist_ok=True)
+
+
+def _store_article(article: Article) -> None:
+    """
+    Save raw text and meta information of an article.
+
+    Args:
+        article (Article): Article instance
+    """
+    to_raw(article)
+    to_meta(article)
 
 
 def main() -> None:
@@ -410,14 +549,18 @@ def main() -> None:
 
     crawler.find_articles()
 
-    for index, url in enumerate(crawler.urls):
-        article_id = index + 1
-        html_parser = HTMLParser(full_url=url, article_id=article_id, config=configuration)
-        article = html_parser.parse()
+    parsers = [HTMLParser(full_url=url, article_id=article_id, config=configuration)
+               for article_id, url in enumerate(crawler.urls, start=1)]
+
+    with ThreadPoolExecutor(max_workers=NUM_FETCH_WORKERS) as executor, \
+            ThreadPoolExecutor(max_workers=1) as writer:
+        futures = []
+        for article in executor.map(HTMLParser.parse, parsers):
+            if isinstance(article, Article):
+                futures.append(writer.submit(_store_article, article))
 
-        if isinstance(article, Article):
-            to_raw(article)
-            to_meta(article)
+        for future in futures:
+            future.result()
 
     print('Done!')
 
@@ -2,10 +2,19 @@
 Pipeline for CONLL-U formatting.
 """
 # pylint: disable=too-few-public-methods, unused-import, undefined-variable, too-many-nested-blocks
+import functools
+import hashlib
+import os
 import pathlib
+import shutil
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator
 
 import spacy_udpipe
 import stanza
+import torch
 from stanza.models.common.doc import Document
 from stanza.pipeline.core import Pipeline
 from stanza.utils.conll import CoNLL
@@ -16,6 +25,13 @@ except ImportError:  # pragma: no cover
     DiGraph = None  # type: ignore
     print('No libraries installed. Failed to import.')
 
+try:
+    from ufal.udpipe import Model as UDPipeModel
+    from ufal.udpipe import Pipeline as UDPipeNativePipeline
+except ImportError:  # pragma: no cover
+    UDPipeModel = None  # type: ignore
+    UDPipeNativePipeline = None  # type: ignore
+
 from core_utils import constants
 from core_utils.article import io
 from core_utils.article.article import Article, ArtifactType, get_article_id_from_filepath
@@ -23,6 +39,24 @@ from core_utils.pipeline import (AbstractCoNLLUAnalyzer, CoNLLUDocument, Library
                                  PipelineProtocol, StanzaDocument, TreeNode)
 from core_utils.visualizer import visualize
 
+# multiprocessing relies on fork to share loaded models and patched module state with workers
+N_WORKER_PROCESSES = (os.cpu_count() or 1) if sys.platform == 'linux' else 1
+
+UDPIPE_BATCH_SIZE = 64
+
+# the raw C binding skips the whole spaCy Doc layer but formats CoNLL-U slightly
+# differently from conll_formatter, so it stays strictly opt-in
+UDPIPE_NATIVE = os.getenv('UDPIPE_NATIVE', '0') == '1' and UDPipeModel is not None
+
+STANZA_PROCESSORS = "tokenize,pos,lemma,depparse"
+
+STANZA_BATCH_SIZES = {
+    'tokenize_batch_size': 64,
+    'pos_batch_size': 2000,
+    'lemma_batch_size': 100,
+    'depparse_batch_size': 5000,
+}
+
 
 class InconsistentDatasetError(Exception):
     """
@@ -42,6 +76,100 @@ class EmptyDirectoryError(Exception):
     """
 
 
+def _iter_upos(path: pathlib.Path) -> Iterator[str]:
+    """
+    Stream UPOS tags from a CoNLL-U file without building Document objects.
+
+    Args:
+        path (pathlib.Path): Path to CoNLL-U file
+
+    Yields:
+        str: UPOS tag of each syntactic word
+    """
+    with open(file=path, mode='r', encoding='utf-8') as file:
+        for line in file:
+            if line == '\n' or line.startswith('#') or not line.strip():
+                continue
+
+            columns = line.split('\t', 4)
+            if '-' in columns[0] or '.' in columns[0]:
+                continue
+
+            yield columns[3]
+
+
+def _is_up_to_date(target: pathlib.Path, source: pathlib.Path) -> bool:
+    """
+    Check that a generated file exists and is not older than its source.
+
+    Args:
+        target (pathlib.Path): Generated file
+        source (pathlib.Path): Source file
+
+    Returns:
+        bool: Whether the target can be reused as is
+    """
+    return (target.exists() and target.stat().st_size > 0
+            and target.stat().st_mtime_ns >= source.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_udpipe_model() -> AbstractCoNLLUAnalyzer:
+    """
+    Load and set up the UDPipe model once per process.
+
+    Returns:
+        AbstractCoNLLUAnalyzer: Loaded model
+    """
+    model = spacy_udpipe.load_from_path(lang="ru", path=str(constants.UDPIPE_MODEL_PATH))
+    model.add_pipe(factory_name="conll_formatter", last=True,
+                   config={"conversion_maps": {"XPOS": {"": "_"}}, "include_headers": True},)
+
+    return model
+
+
+@functools.lru_cache(maxsize=1)
+def _load_native_udpipe_model() -> UDPipeNativePipeline:
+    """
+    Load the UDPipe model through the raw C binding once per process.
+
+    Returns:
+        UDPipeNativePipeline: Loaded native pipeline
+    """
+    model = UDPipeModel.load(str(constants.UDPIPE_MODEL_PATH))
+    return UDPipeNativePipeline(model, 'tokenize',
+                                UDPipeNativePipeline.DEFAULT, UDPipeNativePipeline.DEFAULT,
+                                'conllu')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_stanza_model(no_ssplit: bool = False,
+                       processors: str = STANZA_PROCESSORS) -> Pipeline:
+    """
+    Load and set up the Stanza model once per process.
+
+    Args:
+        no_ssplit (bool): Treat input as pre-segmented and skip the neural sentence splitter
+        processors (str): Comma-separated processors to run
+
+    Returns:
+        Pipeline: Loaded model
+    """
+    language = "ru"
+    use_gpu = torch.cuda.is_available() and os.getenv('STANZA_USE_GPU', '1') != '0'
+    stanza.download(lang=language, processors=processors, logging_level="INFO")
+    model = Pipeline(
+        lang=language,
+        processors=processors,
+        logging_level="INFO",
+        download_method=None,
+        use_gpu=use_gpu,
+        tokenize_no_ssplit=no_ssplit,
+        **STANZA_BATCH_SIZES
+    )
+    return model
+
+
 class CorpusManager:
     """
     Work with articles and store them.
@@ -56,6 +184,7 @@ class CorpusManager:
         """
         self.path_to_raw_txt_data = path_to_raw_txt_data
         self._storage = {}
+        self._raw_files: list[tuple[int, pathlib.Path]] = []
 
         self._validate_dataset()
         self._scan_dataset()
@@ -71,43 +200,61 @@ class CorpusManager:
         if not self.path_to_raw_txt_data.is_dir():
             raise NotADirectoryError
 
-        if not any(self.path_to_raw_txt_data.iterdir()):
+        all_meta = []
+        all_raw = []
+        is_empty = True
+        with os.scandir(self.path_to_raw_txt_data) as entries:
+            for entry in entries:
+                is_empty = False
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith('_meta.json'):
+                    all_meta.append((entry.name, entry.stat().st_size))
+                elif entry.name.endswith('_raw.txt'):
+                    all_raw.append((entry.name, entry.stat().st_size))
+
+        if is_empty:
             raise EmptyDirectoryError
 
-        all_meta = list(self.path_to_raw_txt_data.glob(pattern='*_meta.json'))
-        all_raw = list(self.path_to_raw_txt_data.glob(pattern='*_raw.txt'))
-
-        meta_num = len(all_meta)
-        raw_num = len(all_raw)
-        if meta_num != raw_num:
+        if len(all_meta) != len(all_raw):
             raise InconsistentDatasetError
 
-        all_meta.sort(key=lambda x: int(get_article_id_from_filepath(x)))
-        all_raw.sort(key=lambda x: int(get_article_id_from_filepath(x)))
+        all_meta.sort(key=lambda pair: int(pair[0].split('_', 1)[0]))
+        all_raw.sort(key=lambda pair: int(pair[0].split('_', 1)[0]))
 
-        for i, (meta, raw) in enumerate(zip(all_meta, all_raw), start=1):
-            if meta.stat().st_size == 0 or raw.stat().st_size == 0:
+        for i, ((meta_name, meta_size), (raw_name, raw_size)) in enumerate(
+                zip(all_meta, all_raw), start=1):
+            if meta_size == 0 or raw_size == 0:
                 raise InconsistentDatasetError
 
-            meta_id = get_article_id_from_filepath(meta)
-            raw_id = get_article_id_from_filepath(raw)
-
-            if meta_id != i or raw_id != i:
+            if int(meta_name.split('_', 1)[0]) != i or int(raw_name.split('_', 1)[0]) != i:
                 raise InconsistentDatasetError
 
+        self._raw_files = [(int(name.split('_', 1)[0]), self.path_to_raw_txt_data / name)
+                           for name, _ in all_raw]
+
+
+    @staticmethod
+    def _load_raw_file(entry: tuple[int, pathlib.Path]) -> tuple[int, Article]:
+        """
+        Read one raw file into a storage entry.
+
+        Args:
+            entry (tuple[int, pathlib.Path]): Article id and path to raw file
+
+        Returns:
+            tuple[int, Article]: Article id and loaded Article
+        """
+        article_id, file = entry
+        return article_id, io.from_raw(path=file,
+                                       article=Article(url=None, article_id=article_id))
 
     def _scan_dataset(self) -> None:
         """
         Register each dataset entry.
         """
-        all_raw = self.path_to_raw_txt_data.glob(pattern='*_raw.txt')
-
-        self._storage = {
-            get_article_id_from_filepath(file): io.from_raw(
-                path=file, article=Article(url=None, article_id=get_article_id_from_filepath(file))
-            )
-            for file in all_raw
-        }
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            self._storage = dict(executor.map(self._load_raw_file, self._raw_files))
 
 
     def get_articles(self) -> dict:
@@ -145,16 +292,31 @@ class TextProcessingPipeline(PipelineProtocol):
         """
         articles = self._corpus.get_articles()
 
-        conllu_articles = []
-        if self.analyzer:
-            conllu_articles = self.analyzer.analyze([article.text for article in articles.values()])
+        for article in articles.values():
+            if not _is_up_to_date(article.get_file_path(ArtifactType.CLEANED),
+                                  article.get_raw_text_path()):
+                io.to_cleaned(article)
 
-        for i, article in enumerate(articles.values()):
-            io.to_cleaned(article)
+        if not self.analyzer:
+            return
 
-            if self.analyzer and conllu_articles:
-                article.set_conllu_info(conllu_articles[i])
-                self.analyzer.to_conllu(article)
+        conllu_kind = getattr(self.analyzer, '_conllu_kind', None)
+        stale_articles = [article for article in articles.values()
+                          if conllu_kind is None
+                          or not _is_up_to_date(article.get_file_path(conllu_kind),
+                                                article.get_raw_text_path())]
+
+        conllu_articles = None
+        if stale_articles:
+            conllu_articles = self.analyzer.analyze(
+                [article.text for article in stale_articles])
+
+        if not conllu_articles:
+            return
+
+        for article, conllu_article in zip(stale_articles, conllu_articles):
+            article.set_conllu_info(conllu_article)
+            self.analyzer.to_conllu(article)
 
 
 class UDPipeAnalyzer(LibraryWrapper):
@@ -163,6 +325,7 @@ class UDPipeAnalyzer(LibraryWrapper):
     """
 
     _analyzer: AbstractCoNLLUAnalyzer
+    _conllu_kind = ArtifactType.UDPIPE_CONLLU
 
     def __init__(self) -> None:
         """
@@ -177,11 +340,9 @@ class UDPipeAnalyzer(LibraryWrapper):
         Returns:
             AbstractCoNLLUAnalyzer: Analyzer instance
         """
-        model = spacy_udpipe.load_from_path(lang="ru", path=str(constants.UDPIPE_MODEL_PATH))
-        model.add_pipe(factory_name="conll_formatter", last=True,
-                       config={"conversion_maps": {"XPOS": {"": "_"}}, "include_headers": True},)
-
-        return model
+        if UDPIPE_NATIVE:
+            return _load_native_udpipe_model()
+        return _load_udpipe_model()
 
 
     def analyze(self, texts: list[str]) -> list[StanzaDocument | str]:
@@ -194,7 +355,15 @@ class UDPipeAnalyzer(LibraryWrapper):
         Returns:
             list[StanzaDocument | str]: List of documents
         """
-        return [f'{self._analyzer(text)._.conll_str}\n' for text in texts]
+        if UDPIPE_NATIVE:
+            native_model = _load_native_udpipe_model()
+            return [f'{native_model.process(text)}\n' for text in texts]
+
+        # spaCy multiprocessing returns worker results through Doc.to_bytes(), which cannot
+        # serialize the pandas DataFrame conll_formatter stores in user_data when pandas is
+        # installed; batching in one process is also cheaper for corpora capped at 150 articles
+        docs = self._analyzer.pipe(texts, batch_size=UDPIPE_BATCH_SIZE)
+        return [f'{doc._.conll_str}\n' for doc in docs]
 
     def to_conllu(self, article: Article) -> None:
         """
@@ -203,9 +372,9 @@ class UDPipeAnalyzer(LibraryWrapper):
         Args:
             article (Article): Article containing information to save
         """
-        with open(file=article.get_file_path(
-                kind=ArtifactType.UDPIPE_CONLLU), mode='w', encoding='utf-8') as file:
-            file.write(article.get_conllu_info())
+        data = article.get_conllu_info().encode('utf-8')
+        with open(file=article.get_file_path(kind=self._conllu_kind), mode='wb') as file:
+            file.write(data)
 
 
 
@@ -215,11 +384,20 @@ class StanzaAnalyzer(LibraryWrapper):
     """
 
     _analyzer: AbstractCoNLLUAnalyzer
+    _conllu_kind = ArtifactType.STANZA_CONLLU
 
-    def __init__(self) -> None:
+    def __init__(self, no_ssplit: bool = False, processors: str = STANZA_PROCESSORS) -> None:
         """
         Initialize an instance of the StanzaAnalyzer class.
+
+        Args:
+            no_ssplit (bool): Treat input texts as pre-segmented
+                (one sentence per blank-line-separated block)
+            processors (str): Comma-separated processors to run;
+                e.g. 'tokenize,pos' when only POS tags are consumed
         """
+        self._no_ssplit = no_ssplit
+        self._processors = processors
         self._analyzer = self._bootstrap()
 
     def _bootstrap(self) -> AbstractCoNLLUAnalyzer:
@@ -229,16 +407,7 @@ class StanzaAnalyzer(LibraryWrapper):
         Returns:
             AbstractCoNLLUAnalyzer: Analyzer instance
         """
-        language = "ru"
-        processors = "tokenize,pos,lemma,depparse"
-        stanza.download(lang=language, processors=processors, logging_level="INFO")
-        model = Pipeline(
-            lang=language,
-            processors=processors,
-            logging_level="INFO",
-            download_method=None
-        )
-        return model
+        return _load_stanza_model(self._no_ssplit, self._processors)
 
     def analyze(self, texts: list[str]) -> list[StanzaDocument]:
         """
@@ -250,10 +419,7 @@ class StanzaAnalyzer(LibraryWrapper):
         Returns:
             list[StanzaDocument]: List of documents
         """
-        model = self._analyzer
-        analyzed_texts = model.process([Document(sentences=[], text=text) for text in texts])
-
-        return analyzed_texts
+        return _load_stanza_model(self._no_ssplit, self._processors).bulk_process(texts)
 
 
     def to_conllu(self, article: Article) -> None:
@@ -264,7 +430,7 @@ class StanzaAnalyzer(LibraryWrapper):
             article (Article): Article containing information to save
         """
         CoNLL.write_doc2conll(doc=article.get_conllu_info(),
-                              filename=article.get_file_path(kind=ArtifactType.STANZA_CONLLU))
+                              filename=article.get_file_path(kind=self._conllu_kind))
 
 
     def from_conllu(self, article: Article) -> CoNLLUDocument:
@@ -280,6 +446,56 @@ class StanzaAnalyzer(LibraryWrapper):
         return CoNLL.conll2doc(input_file=article.get_file_path(kind=ArtifactType.STANZA_CONLLU))
 
 
+# the diagram depends only on the POS frequencies, so identical distributions
+# map to identical PNGs; the cache is kept per process
+_RENDER_CACHE: dict[str, pathlib.Path] = {}
+
+
+def _render_pos_diagram(article: Article, image_path: pathlib.Path) -> None:
+    """
+    Render the POS frequency diagram, reusing an identical already rendered one.
+
+    Args:
+        article (Article): Article with POS frequencies filled in
+        image_path (pathlib.Path): Path to the frequency diagram
+    """
+    key = hashlib.blake2b(repr(sorted(article.get_pos_freq().items())).encode(),
+                          digest_size=8).hexdigest()
+
+    cached_path = _RENDER_CACHE.get(key)
+    if cached_path is not None and cached_path.exists():
+        if cached_path != image_path:
+            shutil.copyfile(cached_path, image_path)
+        return
+
+    visualize(article=article, path_to_save=image_path)
+    _RENDER_CACHE[key] = image_path
+
+
+def _process_pos_article(article: Article, conllu_path: pathlib.Path,
+                         image_path: pathlib.Path) -> dict[str, int]:
+    """
+    Count POS frequencies for one article, update its meta file and render the diagram.
+
+    Args:
+        article (Article): Article instance
+        conllu_path (pathlib.Path): Pre-resolved path to CoNLL-U markup
+        image_path (pathlib.Path): Path to the frequency diagram
+
+    Returns:
+        dict[str, int]: POS frequencies
+    """
+    meta_path = article.get_meta_file_path()
+
+    io.from_meta(meta_path, article)
+    article.set_pos_info(dict(Counter(_iter_upos(conllu_path))))
+    io.to_meta(article, meta_path)
+
+    _render_pos_diagram(article, image_path)
+
+    return article.get_pos_freq()
+
+
 class POSFrequencyPipeline:
     """
     Count frequencies of each POS in articles, update meta info and produce graphic report.
@@ -303,16 +519,24 @@ class POSFrequencyPipeline:
         """
         articles = self._corpus.get_articles()
 
-        for i, article in articles.items():
-            if article.get_file_path(kind=ArtifactType.STANZA_CONLLU).stat().st_size == 0:
+        conllu_paths = [article.get_file_path(kind=ArtifactType.STANZA_CONLLU)
+                        for article in articles.values()]
+        for conllu_path in conllu_paths:
+            if conllu_path.stat().st_size == 0:
                 raise EmptyFileError
 
-            io.from_meta(article.get_meta_file_path(), article)
-            article.set_pos_info(self._count_frequencies(article))
-            io.to_meta(article)
+        image_paths = [self._corpus.path_to_raw_txt_data / f'{i}_image.png' for i in articles]
 
-            visualize(article=article,
-                      path_to_save=self._corpus.path_to_raw_txt_data / f'{i}_image.png')
+        if N_WORKER_PROCESSES > 1 and len(articles) > 1:
+            with ProcessPoolExecutor(max_workers=N_WORKER_PROCESSES) as executor:
+                results = executor.map(_process_pos_article,
+                                       articles.values(), conllu_paths, image_paths)
+                for article, pos_freq in zip(articles.values(), results):
+                    article.set_pos_info(pos_freq)
+        else:
+            for article, conllu_path, image_path in zip(articles.values(),
+                                                        conllu_paths, image_paths):
+                _process_pos_article(article, conllu_path, image_path)
 
     def _count_frequencies(self, article: Article) -> dict[str, int]:
         """
@@ -324,15 +548,9 @@ class POSFrequencyPipeline:
         Returns:
             dict[str, int]: POS frequencies
         """
-        pos_freq = {}
-
-        for conllu_sent in self._analyzer.from_conllu(article=article).sentences:
-            word_features = [word.to_dict().get('upos') for word in conllu_sent.words]
-
-            for word in set(word_features):
-                pos_freq[word] = pos_freq.get(word, 0) + word_features.count(word)
+        conllu_path = article.get_file_path(kind=ArtifactType.STANZA_CONLLU)
 
-        return pos_freq
+        return dict(Counter(_iter_upos(conllu_path)))
 
 
 